@@ -7,11 +7,14 @@ setup(
     install_requires=[
         'openpyxl==3.1.2',
         'streamlit==1.24.0',
-        'pandas>=2.1.0',
+        'pandas>=2.2.0',
         'numpy>=1.24.3',
         'pathlib==1.0.1',
         'Pillow==9.5.0',
-        'rich==13.9.4'
+        'rich==13.9.4',
+        'python-calamine>=0.2.0',
+        'pyarrow>=14.0.0',
+        'XlsxWriter>=3.1.0'
     ],
     python_requires='>=3.8,<3.13'
 ) 
\ No newline at end of file
@@ -1,10 +1,420 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import functools
+import hashlib
+import io
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-from openpyxl import load_workbook
+from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font
 
+_MAX_SCAN_WORKERS = min(8, os.cpu_count() or 1)
+
+_CSS = """
+    <style>
+    .stButton > button {
+        width: 100%;
+        background-color: #4CAF50;
+        color: white;
+        padding: 10px 24px;
+        border-radius: 5px;
+        border: none;
+        cursor: pointer;
+    }
+    .stButton > button:hover {
+        background-color: #45a049;
+    }
+    .status-box {
+        padding: 1rem;
+        border-radius: 5px;
+        margin: 1rem 0;
+    }
+    </style>
+"""
+
+# Generated/temp files excluded from every schedule-file scan
+_SKIP_PREFIXES = ('vlookup_', 'duplicate_ssnit_', 'duplicate_', '._', '~$')
+
+def iter_xlsx(root, recursive=False):
+    """Yield schedule xlsx paths under root, skipping generated and temp files"""
+    for entry in os.scandir(root):
+        if entry.is_dir(follow_symlinks=False):
+            if recursive:
+                yield from iter_xlsx(entry.path, recursive=True)
+            continue
+        name = entry.name
+        if name.lower().endswith('.xlsx') and not name.startswith(_SKIP_PREFIXES):
+            yield entry.path
+
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = "calamine"
+except ImportError:
+    _EXCEL_ENGINE = None
+
+try:
+    import xlsxwriter  # noqa: F401
+    _WRITE_ENGINE = "xlsxwriter"
+except ImportError:
+    _WRITE_ENGINE = "openpyxl"
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import pyarrow  # noqa: F401
+    # Arrow-backed strings make .str.strip/.str.upper and equality
+    # checks 2-5x faster than object arrays, with less memory.
+    _STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    _STRING_DTYPE = "string"
+
+# Identity columns normalized to the fast string dtype after every read
+_VLOOKUP_STRING_COLS = ('Ssnit', 'Surname', 'First_Name', 'Other_Names', 'Accountno')
+
+# Placeholder SSNIT values that must never be mapped or reported; the
+# prebuilt Index keeps isin() from rebuilding its hash table per file
+_SSNIT_SENTINELS = frozenset(('NAN', 'NONE', ''))
+_SSNIT_SENTINEL_INDEX = pd.Index(sorted(_SSNIT_SENTINELS))
+
+def _stream_xlsx(path, columns=None):
+    """Stream the active sheet into a DataFrame with openpyxl read_only mode.
+
+    columns optionally prunes each row tuple to a case-insensitive set
+    of header names while streaming, so dropped columns never reach the
+    DataFrame at all.
+    """
+    wanted = {c.lower() for c in columns} if columns else None
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        header = list(header)
+        if wanted is not None:
+            keep = [i for i, c in enumerate(header)
+                    if str(c).strip().lower() in wanted]
+            header = [header[i] for i in keep]
+            rows = ([row[i] if i < len(row) else None for i in keep]
+                    for row in rows)
+        return pd.DataFrame(rows, columns=header)
+    finally:
+        wb.close()
+
+def _read_xlsx(path, columns=None, **kwargs):
+    """Read an xlsx file, preferring the fast calamine engine when installed.
+
+    columns optionally restricts the parse to a case-insensitive set of
+    column names, read as strings -- skipping both the unrelated columns
+    and pandas' per-column type inference.
+    """
+    if _EXCEL_ENGINE is None and not kwargs:
+        # Without calamine, avoid pd.read_excel's full-DOM openpyxl load:
+        # read_only mode streams rows instead of building every cell
+        # object, and the column restriction is applied during the scan
+        # rather than after the full parse.
+        return _stream_xlsx(path, columns)
+    if columns:
+        wanted = {c.lower() for c in columns}
+        kwargs.setdefault('usecols', lambda c: str(c).strip().lower() in wanted)
+        kwargs.setdefault('dtype', str)
+    if _EXCEL_ENGINE:
+        kwargs.setdefault("engine", _EXCEL_ENGINE)
+    return pd.read_excel(path, **kwargs)
+
+def _load_or_build_mapping(folder_path, vlookup_path, master_bytes, build):
+    """Load the merged SSNIT mapping from a parquet sidecar, or build it.
+
+    The sidecar sits next to the vlookup file and is keyed on the
+    vlookup file's mtime plus a digest of the uploaded master bytes,
+    so a stale cache can never be served; loading parquet back is far
+    cheaper than re-deriving the mapping from the two xlsx sources.
+    """
+    sidecar = Path(folder_path) / '.ssnit_mapping.parquet'
+    meta_path = Path(folder_path) / '.ssnit_mapping.json'
+    key = {
+        'vlookup_mtime': os.path.getmtime(vlookup_path),
+        'master_digest': hashlib.md5(master_bytes).hexdigest(),
+    }
+    try:
+        if sidecar.exists() and meta_path.exists():
+            with open(meta_path) as fh:
+                if json.load(fh) == key:
+                    return pd.read_parquet(sidecar)
+    except Exception:
+        # Unreadable cache; fall through and rebuild it
+        pass
+    mapping_df = build()
+    try:
+        mapping_df.to_parquet(sidecar, engine="pyarrow", compression="zstd")
+        with open(meta_path, 'w') as fh:
+            json.dump(key, fh)
+    except Exception:
+        # Best effort -- missing pyarrow or a read-only folder just
+        # means the mapping is rebuilt next run
+        pass
+    return mapping_df
+
+# One str object per distinct value, shared by every cached frame
+_intern = {}
+
+def _intern_col(s):
+    """Deduplicate a column's strings through the shared intern table.
+
+    The same SSNIT, name and account strings recur across all of a
+    company's schedules, but each read allocates fresh str objects per
+    cell. Routing the unique values through one module-wide table makes
+    every frame reference a single object per distinct string.
+    """
+    table = {}
+    for v in s.dropna().unique():
+        table[v] = _intern.setdefault(v, v)
+    return s.map(table) if table else s
+
+_IDENTITY_COLS = ('ssnit', 'accountno', 'surname', 'first_name', 'other_name')
+
+@functools.lru_cache(maxsize=256)
+def _read_xlsx_cached(path, mtime, columns):
+    df = _read_xlsx(path, columns=columns)
+    for col in _IDENTITY_COLS:
+        if col in df.columns and df[col].dtype == object:
+            df[col] = _intern_col(df[col])
+    return df
+
+def read_schedule(path, columns=None):
+    """Read a schedule xlsx through a module-level (path, mtime) cache.
+
+    The different tools re-read the same schedule files several times
+    per session; caching the parsed frames skips those repeat parses.
+    Unlike the st.cache_data loaders this also works off the main
+    thread, so the parallel per-file workers can share it. Callers
+    mutate the frames in place, hence the defensive copy, and rewrites
+    bump the mtime so stale entries are never served.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return _read_xlsx(path, columns=columns)
+    return _read_xlsx_cached(str(path), mtime, columns).copy()
+
+def _normalize_ssnit(df, col='ssnit'):
+    """Strip a SSNIT column in place, once per frame.
+
+    The cleaning passes overlap heavily across the tools, and each one
+    used to allocate a fresh object array. A flag in df.attrs marks
+    frames whose column is already normalized so repeat calls cost
+    nothing; attrs survive .copy(), so frames served from the read
+    caches arrive pre-cleaned.
+    """
+    flag = f'{col}_clean'
+    if df.attrs.get(flag):
+        return df
+    df[col] = df[col].astype(_STRING_DTYPE).str.strip()
+    df.attrs[flag] = True
+    return df
+
+def _rowwise_kernel(fn):
+    """Compile a row-wise fallback kernel with numba when it is installed.
+
+    The schedule pipeline is fully vectorized, but rules that cannot be
+    expressed as map/merge logic (fuzzy SSNIT matching, multi-field
+    fallbacks) would otherwise land back on iterrows. Kernels written
+    against plain numpy arrays -- df[col].to_numpy() in, arrays out --
+    and wrapped with this decorator run through numba's nopython JIT
+    when available, and as ordinary Python otherwise.
+    """
+    if numba is not None:
+        return numba.njit(cache=True)(fn)
+    return fn
+
+def _clean_salary(s):
+    """Coerce a salary column to numeric, skipping the string pass when
+    the reader already produced numbers"""
+    if pd.api.types.is_numeric_dtype(s):
+        return s
+    return pd.to_numeric(
+        s.astype(str).str.replace(',', '', regex=False).str.strip(), errors='coerce')
+
+def fast_to_excel(df, path):
+    """Stream a DataFrame to xlsx through an openpyxl write-only workbook.
+
+    Write-only worksheets only accept appended rows and flush them as
+    they arrive, so the save never materializes the worksheet's cell
+    objects. itertuples hands over native Python values per column, and
+    NaNs are swapped for None so openpyxl accepts the cells.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(list(df.columns))
+    # Drop to object dtype first: where() on the pandas string dtypes
+    # coerces the None straight back to pd.NA, which openpyxl rejects
+    df = df.astype(object).where(df.notna(), None)
+    for row in df.itertuples(index=False, name=None):
+        ws.append(row)
+    wb.save(path)
+
+def _write_xlsx(df, path):
+    """Write a DataFrame to xlsx, preferring xlsxwriter when available.
+
+    xlsxwriter serializes cells much faster than openpyxl's default
+    writer. Its constant_memory mode is deliberately NOT used: pandas
+    writes cells column by column, and constant_memory discards writes
+    to already-flushed rows, silently emptying every column after the
+    first. Without xlsxwriter the write streams through an openpyxl
+    write-only workbook instead.
+    """
+    if _WRITE_ENGINE == "xlsxwriter":
+        df.to_excel(path, engine="xlsxwriter", index=False)
+    else:
+        fast_to_excel(df, path)
+
+@st.cache_data(show_spinner=False)
+def load_excel(path, mtime, size, columns=None, **kwargs):
+    """Cached Excel read; mtime and size key the cache so edits invalidate.
+
+    columns optionally restricts the parse to a case-insensitive set of
+    column names, read as strings -- skipping both the unrelated columns
+    and pandas' per-column type inference.
+    """
+    df = _read_xlsx(path, columns=columns, **kwargs)
+    if 'ssnit' in df.columns:
+        # Normalize once at read time so the scan loops can compare
+        # directly instead of re-stripping the column on every visit.
+        df['ssnit'] = df['ssnit'].astype(_STRING_DTYPE).str.strip()
+    string_cols = {c: _STRING_DTYPE for c in _VLOOKUP_STRING_COLS if c in df.columns}
+    if string_cols:
+        df = df.astype(string_cols)
+    return df
+
+def load_excel_cached(path, **kwargs):
+    """Read an xlsx file through the Streamlit cache keyed on (path, mtime, size)"""
+    stat = os.stat(path)
+    return load_excel(str(path), stat.st_mtime, stat.st_size, **kwargs)
+
+def _full_name(df):
+    """Vectorized Surname/First_Name/Other_Names concatenation"""
+    return (df['Surname'].fillna('').astype(str) + ' ' +
+            df['First_Name'].fillna('').astype(str) + ' ' +
+            df['Other_Names'].fillna('').astype(str)).str.strip()
+
+def _sorted_full_name(full_names):
+    """Token-sorted rendering of each name, computed off one vectorized split"""
+    return [' '.join(sorted(parts)) for parts in full_names.str.split()]
+
+def load_vlookup(folder_path):
+    """Load the company vlookup file, preferring a faster Parquet sidecar"""
+    folder = Path(folder_path)
+    xlsx_path = folder / f"vlookup_{folder.name}.xlsx"
+    parquet_path = xlsx_path.with_suffix('.parquet')
+    if parquet_path.exists() and parquet_path.stat().st_mtime >= xlsx_path.stat().st_mtime:
+        try:
+            return pd.read_parquet(parquet_path)
+        except Exception:
+            pass  # unreadable sidecar; fall back to the xlsx
+    df = load_excel_cached(xlsx_path)
+    try:
+        df.to_parquet(parquet_path, engine="pyarrow", compression="zstd", index=False)
+    except Exception:
+        pass  # the sidecar is only a cache; keep going without it
+    return df
+
+@st.cache_data(show_spinner=False)
+def load_master(file_bytes, columns=None):
+    """Cached read of the uploaded master report, keyed on its bytes"""
+    return _read_xlsx(io.BytesIO(file_bytes), columns=columns)
+
+@st.cache_data(show_spinner=False)
+def partition_by_employer(file_bytes):
+    """Read the almighty report and pre-split it into per-employer frames.
+
+    Cached on the upload's bytes, so processing several companies from
+    the same report parses and partitions it only once.
+    """
+    df = _read_xlsx(io.BytesIO(file_bytes))
+    if 'Employer Name' not in df.columns:
+        return df, {}
+    indices = df.groupby('Employer Name', sort=False).indices
+    return df, {name: df.take(idx) for name, idx in indices.items()}
+
+@st.cache_data(show_spinner=False)
+def build_ssnit_index(files_signature):
+    """Index every SSNIT occurrence in the given schedule files.
+
+    The cache is keyed by the (folder, file, path, mtime) signature, so
+    file edits invalidate automatically and repeat queries in a session
+    become plain dictionary lookups. Salary values are kept raw and
+    cleaned at query time so one bad cell does not poison the index.
+    """
+    index = {}
+    errors = []
+    for folder, file, path, _mtime in files_signature:
+        try:
+            df = load_excel_cached(path, columns=('ssnit', 'name', 'salary'))
+            if 'ssnit' not in df.columns:
+                continue
+            names = df['name'] if 'name' in df.columns else None
+            salaries = df['salary'] if 'salary' in df.columns else None
+            for pos, ssnit in enumerate(df['ssnit']):
+                record = {'Folder': folder, 'File': file, 'SSNIT': ssnit}
+                if names is not None:
+                    record['Name'] = names.iat[pos]
+                if salaries is not None:
+                    record['_salary_raw'] = salaries.iat[pos]
+                index.setdefault(ssnit, []).append(record)
+        except Exception as e:
+            errors.append((folder, file, str(e)))
+    return index, errors
+
+@st.cache_data(show_spinner=False)
+def _normalize_vlookup(folder_path, mtime, size):
+    """Vlookup frame with the shared derived columns precomputed"""
+    df = load_vlookup(folder_path)
+    df['FullName'] = _full_name(df)
+    df['SortedFullName'] = _sorted_full_name(df['FullName'])
+    df['Ssnit'] = df['Ssnit'].astype(_STRING_DTYPE).str.strip()
+    df['Accountno'] = df['Accountno'].astype(_STRING_DTYPE).str.strip().str.upper()
+    return df
+
+def normalize_vlookup(folder_path):
+    """Cached, normalized vlookup frame for a company folder.
+
+    The duplicate checkers all need the same FullName/SortedFullName and
+    cleaned Ssnit/Accountno columns; computing them here means the work
+    happens once per file version instead of once per function.
+    """
+    folder = Path(folder_path)
+    stat = (folder / f"vlookup_{folder.name}.xlsx").stat()
+    return _normalize_vlookup(str(folder_path), stat.st_mtime, stat.st_size)
+
+def _scan_file(file_path, ssnit_number):
+    """Search one schedule file for a SSNIT number; returns a result record or None"""
+    df = load_excel_cached(file_path, columns=('ssnit', 'name'))
+    if 'ssnit' not in df.columns:
+        return None
+    match = df[df['ssnit'] == ssnit_number]
+    if match.empty:
+        return None
+    return {
+        'File': Path(file_path).name,
+        'Names': match['name'].astype(str).str.cat(sep=', ')
+    }
+
+def _scan_file_for_ssnits(file_path, ssnit_set):
+    """Return which of ssnit_set appear in one schedule file (None if no ssnit column)"""
+    df = load_excel_cached(file_path, columns=('ssnit',))
+    if 'ssnit' not in df.columns:
+        return None
+    # Hash the file's SSNITs once; answering the query is then a set
+    # intersection instead of a boolean mask over the whole column.
+    return ssnit_set & set(df['ssnit'].dropna())
+
 class DashboardUtils:
     @staticmethod
     def select_folder(key_suffix="default"):
@@ -73,27 +483,10 @@ class Dashboard:
 
     def apply_custom_css(self):
         """Apply custom CSS styling"""
-        st.markdown("""
-            <style>
-            .stButton > button {
-                width: 100%;
-                background-color: #4CAF50;
-                color: white;
-                padding: 10px 24px;
-                border-radius: 5px;
-                border: none;
-                cursor: pointer;
-            }
-            .stButton > button:hover {
-                background-color: #45a049;
-            }
-            .status-box {
-                padding: 1rem;
-                border-radius: 5px;
-                margin: 1rem 0;
-            }
-            </style>
-        """, unsafe_allow_html=True)
+        # The style block still has to be emitted on every rerun --
+        # Streamlit rebuilds the page each run, so a session-state guard
+        # would drop the styling after the first interaction.
+        st.markdown(_CSS, unsafe_allow_html=True)
 
     def create_sidebar(self):
         """Create and return the sidebar navigation"""
@@ -130,6 +523,13 @@ class Dashboard:
                 ]
             )
             
+            st.markdown("---")
+            if st.button("🧹 Clear file cache"):
+                _read_xlsx_cached.cache_clear()
+                _intern.clear()
+                st.cache_data.clear()
+                st.success("Cached file reads cleared")
+            
             st.markdown("---")
             st.markdown("### ℹ️ About")
             st.info("Process and validate schedule files for pension management.")
@@ -154,8 +554,7 @@ class Dashboard:
                 return
                 
             with st.spinner("Processing duplicates..."):
-                df = pd.read_excel(vlookup_path)
-                df['FullName'] = df[['Surname', 'First_Name', 'Other_Names']].fillna('').astype(str).agg(' '.join, axis=1)
+                df = normalize_vlookup(folder_path)
                 duplicates = df[df.duplicated(subset='FullName', keep=False)]
                 
                 if duplicates.empty:
@@ -166,7 +565,7 @@ class Dashboard:
                     
                     if st.button("Export Results"):
                         export_path = Path(folder_path) / "duplicates.xlsx"
-                        duplicates.to_excel(export_path, index=False)
+                        duplicates.to_excel(export_path, index=False, engine=_WRITE_ENGINE)
                         st.success(f"Results exported to: {export_path}")
                         
         except Exception as e:
@@ -185,27 +584,22 @@ class Dashboard:
         if st.button("Search") and ssnit_number:
             try:
                 results = []
-                files = list(Path(folder_path).glob("*.xlsx"))
+                files = [Path(p) for p in iter_xlsx(folder_path)]
                 
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                for idx, file_path in enumerate(files):
-                    if file_path.name.startswith(("vlookup_", "duplicate_ssnit_")):
-                        continue
-                        
-                    status_text.text(f"Searching in {file_path.name}...")
-                    progress_bar.progress((idx + 1) / len(files))
-                    
-                    df = pd.read_excel(file_path)
-                    if 'ssnit' in df.columns:
-                        df['ssnit'] = df['ssnit'].astype(str).str.strip()
-                        match = df[df['ssnit'] == ssnit_number]
-                        if not match.empty:
-                            results.append({
-                                'File': file_path.name,
-                                'Names': ', '.join(match['name'].tolist())
-                            })
+                # Parsing releases the GIL inside the engine, so scan files
+                # concurrently and fold results in as they complete.
+                with ThreadPoolExecutor(max_workers=_MAX_SCAN_WORKERS) as executor:
+                    futures = {executor.submit(_scan_file, f, ssnit_number): f
+                               for f in files}
+                    for done, future in enumerate(as_completed(futures), start=1):
+                        status_text.text(f"Searched {futures[future].name}...")
+                        progress_bar.progress(done / len(files))
+                        record = future.result()
+                        if record:
+                            results.append(record)
                 
                 progress_bar.empty()
                 status_text.empty()
@@ -242,7 +636,7 @@ class Dashboard:
             try:
                 # Read the almighty report
                 with st.spinner("Reading almighty report..."):
-                    df = pd.read_excel(almighty_file)
+                    df, by_employer = partition_by_employer(almighty_file.getvalue())
                 
                 # Validate required columns
                 missing_columns = [col for col in required_columns if col not in df.columns]
@@ -259,15 +653,18 @@ class Dashboard:
                     
                     # Process the data
                     with st.spinner("Processing data..."):
-                        # Filter by company name
-                        company_df = df[df['Employer Name'] == company_name]
+                        # Look the company up in the cached partition
+                        company_df = by_employer.get(company_name, df.iloc[0:0])
                         
                         if company_df.empty:
                             st.error(f"No data found for company: {company_name}")
                             return
                         
-                        # Clean SSNIT numbers
-                        company_df.loc[:, 'Ssnit'] = company_df['Ssnit'].str.strip()
+                        # Clean SSNIT numbers on an explicit copy; assigning
+                        # through .loc on the partition slice forced pandas down
+                        # its chained-assignment checking path on every write.
+                        company_df = company_df.copy()
+                        company_df['Ssnit'] = company_df['Ssnit'].astype(_STRING_DTYPE).str.strip()
                         
                         # Select and rename columns
                         columns_to_keep = [
@@ -290,7 +687,7 @@ class Dashboard:
                         # Export option
                         if st.button("Generate VLOOKUP File", key="generate_vlookup"):
                             output_path = Path(folder_path) / f'vlookup_{company_name}.xlsx'
-                            selected_columns_df.to_excel(output_path, index=False)
+                            _write_xlsx(selected_columns_df, output_path)
                             st.success(f"VLOOKUP file has been created: {output_path}")
                             
                             # Display summary
@@ -347,9 +744,7 @@ class Dashboard:
         
         try:
             # Read VLOOKUP file and process names
-            company_df = pd.read_excel(vlookup_path)
-            company_df['FullName'] = company_df[['Surname', 'First_Name', 'Other_Names']].fillna('').astype(str).agg(' '.join, axis=1)
-            company_df['SortedFullName'] = company_df['FullName'].apply(lambda x: ' '.join(sorted(x.split())))
+            company_df = normalize_vlookup(main_folder_path)
             company_df.sort_values(by='SortedFullName', inplace=True)
             
             # Find duplicates
@@ -359,68 +754,78 @@ class Dashboard:
             if not duplicates.empty:
                 st.warning(f"Found {len(duplicates) // 2} duplicate names!")
                 
-                # Create dictionary of duplicates
-                duplicate_dict = {}
-                for idx, row in duplicates.iterrows():
-                    name = row['SortedFullName']
-                    ssnit = row['Ssnit']
-                    if name not in duplicate_dict:
-                        duplicate_dict[name] = set()
-                    duplicate_dict[name].add(ssnit)
+                # Group the duplicates once to map each name to its SSNITs
+                duplicate_dict = {name: set(group['Ssnit'])
+                                  for name, group in duplicates.groupby('SortedFullName', sort=False)}
                 
-                # Display duplicates in expandable sections
-                for name, ssnit_set in duplicate_dict.items():
-                    with st.expander(f"🔍 {name} ({len(ssnit_set)} SSNITs)"):
-                        # Show the duplicate entries
-                        st.dataframe(
-                            duplicates[duplicates['SortedFullName'] == name],
-                            column_config={
-                                "Ssnit": "SSNIT Number",
-                                "Surname": "Surname",
-                                "First_Name": "First Name",
-                                "Other_Names": "Other Names",
-                                "Accountno": "Account Number",
-                                "Accountno2": "Account Number 2"
-                            },
-                            hide_index=True
-                        )
-                        
-                        # Check schedule files for these SSNITs
-                        st.markdown("##### 📁 Found in Schedule Files:")
-                        schedule_findings = []
-                        
-                        for root, dirs, files in os.walk(main_folder_path):
-                            for file in files:
-                                if (file.lower().endswith('.xlsx') and 
-                                    not file.startswith(('vlookup_', 'duplicate_ssnit_', '._', '~$'))):
-                                    file_path = os.path.join(root, file)
-                                    try:
-                                        df = pd.read_excel(file_path)
-                                        if 'ssnit' not in df.columns:
-                                            st.warning(f"⚠️ No SSNIT column in {file}")
-                                            continue
-                                            
-                                        df['ssnit'] = df['ssnit'].astype(str).str.strip()
-                                        ssnit_in_file = set(df[df['ssnit'].isin(ssnit_set)]['ssnit'])
-                                        
-                                        if len(ssnit_in_file) > 1:
-                                            schedule_findings.append({
-                                                'File': file,
-                                                'SSNITs Found': ', '.join(ssnit_in_file)
-                                            })
-                                            
-                                    except Exception as e:
-                                        st.error(f"Error processing {file}: {str(e)}")
+                # Scan every schedule file once for the union of duplicate
+                # SSNITs; each group below then answers from this index
+                # instead of re-walking and re-reading the whole tree.
+                schedule_files = [(os.path.basename(p), p)
+                                  for p in iter_xlsx(main_folder_path, recursive=True)]
+                
+                all_ssnits = frozenset().union(*duplicate_dict.values())
+                ssnit_index = {}
+                with ThreadPoolExecutor(max_workers=_MAX_SCAN_WORKERS) as executor:
+                    futures = {
+                        executor.submit(_scan_file_for_ssnits, path, all_ssnits): file
+                        for file, path in schedule_files
+                    }
+                    for future in as_completed(futures):
+                        file = futures[future]
+                        try:
+                            found = future.result()
+                        except Exception as e:
+                            st.error(f"Error processing {file}: {str(e)}")
+                            continue
                         
-                        if schedule_findings:
-                            st.table(pd.DataFrame(schedule_findings))
+                        if found is None:
+                            st.warning(f"⚠️ No SSNIT column in {file}")
                         else:
-                            st.info("No multiple SSNITs found in schedule files")
+                            ssnit_index[file] = found
+                
+                # Render one consolidated, sortable table instead of an
+                # expander + dataframe per name: Streamlit re-serializes
+                # every widget on each rerun, so per-group layouts made
+                # rerun cost scale with the number of duplicate groups.
+                st.dataframe(
+                    duplicates,
+                    column_config={
+                        "SortedFullName": "Name",
+                        "Ssnit": "SSNIT Number",
+                        "Surname": "Surname",
+                        "First_Name": "First Name",
+                        "Other_Names": "Other Names",
+                        "Accountno": "Account Number",
+                        "Accountno2": "Account Number 2"
+                    },
+                    hide_index=True,
+                    use_container_width=True
+                )
+                
+                # Schedule-file drilldown for every group in one table
+                st.markdown("##### 📁 Multiple SSNITs Found in Schedule Files:")
+                schedule_findings = []
+                for name, ssnit_set in duplicate_dict.items():
+                    for file, found in ssnit_index.items():
+                        ssnit_in_file = found & ssnit_set
+                        if len(ssnit_in_file) > 1:
+                            schedule_findings.append({
+                                'Name': name,
+                                'File': file,
+                                'SSNITs Found': ', '.join(ssnit_in_file)
+                            })
+                
+                if schedule_findings:
+                    st.dataframe(pd.DataFrame(schedule_findings),
+                                 hide_index=True, use_container_width=True)
+                else:
+                    st.info("No multiple SSNITs found in schedule files")
                 
                 # Export option
                 if st.button("Export Results"):
                     export_path = os.path.join(main_folder_path, f"duplicate_ssnit_{company_name}.xlsx")
-                    duplicates.to_excel(export_path, index=False)
+                    duplicates.to_excel(export_path, index=False, engine=_WRITE_ENGINE)
                     st.success(f"Results exported to: {export_path}")
                 
             else:
@@ -455,13 +860,11 @@ class Dashboard:
         if main_folder_path and st.button("Check for Duplicates", type="primary"):
             try:
                 # Read VLOOKUP file
-                df = pd.read_excel(vlookup_path)
+                df = normalize_vlookup(main_folder_path)
                 
-                # Clean and standardize account numbers and names
-                df['Accountno'] = df['Accountno'].astype(str).str.strip().str.upper()
-                df['Full_Name'] = (df['Surname'].fillna('') + ' ' + 
-                                 df['First_Name'].fillna('') + ' ' + 
-                                 df['Other_Names'].fillna('')).str.strip().str.upper()
+                # Accountno/FullName arrive pre-cleaned; names are compared
+                # case-insensitively here
+                df['Full_Name'] = df['FullName'].str.upper()
                 
                 # Find duplicates by account number
                 account_duplicates = df[df.duplicated(subset='Accountno', keep=False)].sort_values('Accountno')
@@ -476,23 +879,21 @@ class Dashboard:
                 if not account_duplicates.empty:
                     st.warning(f"Found {len(account_duplicates) // 2} duplicate Account Numbers!")
                     
-                    # Group by Account number for better display
-                    for account in account_duplicates['Accountno'].unique():
-                        with st.expander(f"Account Number: {account}"):
-                            account_records = account_duplicates[account_duplicates['Accountno'] == account]
-                            
-                            # Display with formatted columns
-                            st.dataframe(
-                                account_records[['Accountno', 'Surname', 'First_Name', 'Other_Names', 'Ssnit']],
-                                column_config={
-                                    "Accountno": "Account Number",
-                                    "Surname": "Surname",
-                                    "First_Name": "First Name",
-                                    "Other_Names": "Other Names",
-                                    "Ssnit": "SSNIT Number"
-                                },
-                                hide_index=True
-                            )
+                    # One sorted table with the account number as the group
+                    # column; per-account expanders cost a dataframe
+                    # serialization each on every rerun
+                    st.dataframe(
+                        account_duplicates[['Accountno', 'Surname', 'First_Name', 'Other_Names', 'Ssnit']],
+                        column_config={
+                            "Accountno": "Account Number",
+                            "Surname": "Surname",
+                            "First_Name": "First Name",
+                            "Other_Names": "Other Names",
+                            "Ssnit": "SSNIT Number"
+                        },
+                        hide_index=True,
+                        use_container_width=True
+                    )
                 else:
                     st.success("No duplicate Account Numbers found!")
                 
@@ -503,21 +904,17 @@ class Dashboard:
                 if not name_duplicates.empty:
                     st.warning(f"Found {len(name_duplicates) // 2} duplicate Names!")
                     
-                    # Group by Full Name for better display
-                    for name in name_duplicates['Full_Name'].unique():
-                        with st.expander(f"Name: {name}"):
-                            name_records = name_duplicates[name_duplicates['Full_Name'] == name]
-                            
-                            # Display with formatted columns
-                            st.dataframe(
-                                name_records[['Full_Name', 'Accountno', 'Ssnit']],
-                                column_config={
-                                    "Full_Name": "Full Name",
-                                    "Accountno": "Account Number",
-                                    "Ssnit": "SSNIT Number"
-                                },
-                                hide_index=True
-                            )
+                    # Same single-table treatment as the account duplicates
+                    st.dataframe(
+                        name_duplicates[['Full_Name', 'Accountno', 'Ssnit']],
+                        column_config={
+                            "Full_Name": "Full Name",
+                            "Accountno": "Account Number",
+                            "Ssnit": "SSNIT Number"
+                        },
+                        hide_index=True,
+                        use_container_width=True
+                    )
                 else:
                     st.success("No duplicate Names found!")
                 
@@ -526,7 +923,7 @@ class Dashboard:
                     st.markdown("---")
                     if st.button("Export Duplicates"):
                         export_path = os.path.join(main_folder_path, f"duplicate_analysis_{company_name}.xlsx")
-                        with pd.ExcelWriter(export_path, engine='openpyxl') as writer:
+                        with pd.ExcelWriter(export_path, engine=_WRITE_ENGINE) as writer:
                             if not account_duplicates.empty:
                                 account_duplicates.to_excel(writer, sheet_name='Account_Duplicates', index=False)
                             if not name_duplicates.empty:
@@ -601,8 +998,8 @@ class Dashboard:
                     if search_type in ["VLOOKUP File", "Both"]:
                         vlookup_path = Path(main_folder_path) / f"vlookup_{company_name}.xlsx"
                         if vlookup_path.exists():
-                            vlookup_df = pd.read_excel(vlookup_path)
-                            vlookup_df['Ssnit'] = vlookup_df['Ssnit'].astype(str).str.strip()
+                            vlookup_df = load_vlookup(main_folder_path)
+                            _normalize_ssnit(vlookup_df, 'Ssnit')
                             
                             vlookup_matches = vlookup_df[vlookup_df['Ssnit'] == ssnit_number]
                             
@@ -629,55 +1026,40 @@ class Dashboard:
                         
                         folders_to_search = schedule_folders if selected_option == "Search All Folders" else [selected_option]
                         
-                        progress_bar = st.progress(0)
-                        status_text = st.empty()
-                        
-                        for folder_idx, folder in enumerate(folders_to_search):
+                        # Build (or reuse) the cached SSNIT index for the
+                        # selected folders; subsequent searches in the same
+                        # session are O(1) lookups instead of full rescans.
+                        files_signature = []
+                        for folder in folders_to_search:
                             folder_path = os.path.join(main_folder_path, folder)
-                            status_text.text(f"Searching in folder: {folder}")
-                            
                             files = [f for f in os.listdir(folder_path) 
                                     if f.lower().endswith('.xlsx') and 
                                     not f.startswith((f"vlookup_{company_name}", 
                                                     f"duplicate_ssnit_{company_name}",
                                                     "._", "~$", "duplicate_"))]
-                            
                             for file in files:
                                 file_path = os.path.join(folder_path, file)
-                                try:
-                                    df = pd.read_excel(file_path)
-                                    
-                                    if 'ssnit' not in df.columns:
-                                        continue
-                                        
-                                    df['ssnit'] = df['ssnit'].astype(str).str.strip()
-                                    matches = df[df['ssnit'] == ssnit_number]
-                                    
-                                    if not matches.empty:
-                                        for _, row in matches.iterrows():
-                                            record = {
-                                                'Folder': folder,
-                                                'File': file,
-                                                'SSNIT': ssnit_number
-                                            }
-                                            
-                                            if 'name' in df.columns:
-                                                record['Name'] = row['name']
-                                            if 'salary' in df.columns:
-                                                # Clean salary value by removing spaces and commas before converting to float
-                                                salary_str = str(row['salary']).strip().replace(',', '').replace(' ', '')
-                                                salary_value = float(salary_str)
-                                                record['Salary'] = salary_value
-                                            
-                                            found_records.append(record)
-                                
-                                except Exception as e:
-                                    st.error(f"Error processing {folder}/{file}: {str(e)}")
-                            
-                            progress_bar.progress((folder_idx + 1) / len(folders_to_search))
+                                files_signature.append(
+                                    (folder, file, file_path, os.path.getmtime(file_path))
+                                )
                         
-                        progress_bar.empty()
-                        status_text.empty()
+                        with st.spinner("Indexing schedule files..."):
+                            ssnit_index, index_errors = build_ssnit_index(tuple(files_signature))
+                        
+                        for folder, file, error in index_errors:
+                            st.error(f"Error processing {folder}/{file}: {error}")
+                        
+                        for record in ssnit_index.get(ssnit_number, []):
+                            record = dict(record)
+                            salary_raw = record.pop('_salary_raw', None)
+                            if salary_raw is not None:
+                                try:
+                                    # Clean salary value by removing spaces and commas before converting to float
+                                    record['Salary'] = float(str(salary_raw).strip().replace(',', '').replace(' ', ''))
+                                except ValueError:
+                                    st.error(f"Error processing {record['Folder']}/{record['File']}: invalid salary {salary_raw!r}")
+                                    continue
+                            found_records.append(record)
                         
                         # Display schedule search results
                         if found_records:
@@ -707,7 +1089,13 @@ class Dashboard:
                         st.markdown("---")
                         if st.button("Export Results"):
                             export_path = os.path.join(main_folder_path, f"ssnit_search_{ssnit_number}.xlsx")
-                            with pd.ExcelWriter(export_path, engine='openpyxl') as writer:
+                            # xlsxwriter serializes faster than openpyxl;
+                            # no constant_memory here -- pandas writes by
+                            # column and that mode drops flushed rows
+                            writer_kwargs = (
+                                {'engine': 'xlsxwriter'}
+                                if _WRITE_ENGINE == 'xlsxwriter' else {'engine': 'openpyxl'})
+                            with pd.ExcelWriter(export_path, **writer_kwargs) as writer:
                                 if search_type in ["VLOOKUP File", "Both"] and not vlookup_matches.empty:
                                     vlookup_matches.to_excel(writer, sheet_name='VLOOKUP_Results', index=False)
                                 if search_type in ["Schedule Files", "Both"] and found_records:
@@ -749,58 +1137,47 @@ class Dashboard:
             return
         
         try:
-            # Read and process files
-            master_df = pd.read_excel(master_file)
-            vlookup_db = pd.read_excel(vlookup_path)
-            
-            # Clean and standardize the data
-            master_df['Ssnit'] = master_df['Ssnit'].astype(str).str.strip()
-            vlookup_db['Ssnit'] = vlookup_db['Ssnit'].astype(str).str.strip()
+            mapping_fields = ['accountno', 'surname', 'first_name', 'other_name']
+            master_bytes = master_file.getvalue()
             
-            # Create dictionaries for lookups
-            vlookup_dict = {}
-            for _, row in vlookup_db.iterrows():
-                ssnit = str(row['Ssnit']).strip()
-                vlookup_dict[ssnit] = {
-                    'accountno': str(row['Accountno']).strip() if pd.notna(row['Accountno']) else None,
-                    'surname': row['Surname'] if pd.notna(row['Surname']) else None,
-                    'first_name': row['First_Name'] if pd.notna(row['First_Name']) else None,
-                    'other_name': row['Other_Names'] if pd.notna(row['Other_Names']) else None
-                }
+            def _build_mapping():
+                # Read and process files, parsing only the columns each
+                # lookup actually consumes
+                master_df = load_master(master_bytes, columns=(
+                    'Ssnit', 'Client Account Number', 'Surname', 'First Name', 'Other Names'))
+                vlookup_db = load_excel_cached(vlookup_path, columns=(
+                    'Ssnit', 'Accountno', 'Surname', 'First_Name', 'Other_Names'))
+                
+                # Clean and standardize the data
+                _normalize_ssnit(master_df, 'Ssnit')
+                _normalize_ssnit(vlookup_db, 'Ssnit')
+                
+                # Build the SSNIT mapping in vectorized pandas instead of
+                # per-row dict inserts: align the master columns with the
+                # vlookup ones, index both by Ssnit and let combine_first
+                # fill the gaps (vlookup wins wherever it has a value)
+                v = vlookup_db.rename(columns={
+                    'Accountno': 'accountno', 'Surname': 'surname',
+                    'First_Name': 'first_name', 'Other_Names': 'other_name'})
+                m = master_df.rename(columns={
+                    'Client Account Number': 'accountno', 'Surname': 'surname',
+                    'First Name': 'first_name', 'Other Names': 'other_name'})
+                v = v[~v['Ssnit'].duplicated(keep='last')].set_index('Ssnit')[mapping_fields]
+                m = m[~m['Ssnit'].duplicated(keep='last')].set_index('Ssnit')[mapping_fields]
+                mapping = v.replace('', pd.NA).combine_first(m.replace('', pd.NA))
+                mapping['accountno'] = mapping['accountno'].astype('string').str.strip()
+                return mapping
             
-            # Add master data for missing entries
-            for _, row in master_df.iterrows():
-                ssnit = str(row['Ssnit']).strip()
-                if ssnit not in vlookup_dict:
-                    vlookup_dict[ssnit] = {
-                        'accountno': str(row['Client Account Number']).strip() if pd.notna(row['Client Account Number']) else None,
-                        'surname': row['Surname'] if pd.notna(row['Surname']) else None,
-                        'first_name': row['First Name'] if pd.notna(row['First Name']) else None,
-                        'other_name': row['Other Names'] if pd.notna(row['Other Names']) else None
-                    }
-                else:
-                    # Fill in missing data from master
-                    entry = vlookup_dict[ssnit]
-                    if not entry['accountno']:
-                        entry['accountno'] = str(row['Client Account Number']).strip() if pd.notna(row['Client Account Number']) else None
-                    if not entry['surname']:
-                        entry['surname'] = row['Surname']
-                    if not entry['first_name']:
-                        entry['first_name'] = row['First Name']
-                    if not entry['other_name']:
-                        entry['other_name'] = row['Other Names']
+            # Reuse the persisted mapping when neither source changed;
+            # otherwise build it once and cache it beside the vlookup
+            mapping_df = _load_or_build_mapping(
+                main_folder_path, vlookup_path, master_bytes, _build_mapping)
             
-            # Process files
-            files_to_process = []
-            for root, _, files in os.walk(main_folder_path):
-                for file in files:
-                    if (file.lower().endswith('.xlsx') and 
-                        not file.startswith(('vlookup_', 'duplicate_', '._', '~$'))):
-                        files_to_process.append({
-                            'path': os.path.join(root, file),
-                            'name': file,
-                            'status': 'Pending ⌛'
-                        })
+            # Process files; iter_xlsx walks with scandir, so the
+            # type and prefix filters reuse the cached direntry data
+            files_to_process = [
+                {'path': path, 'name': os.path.basename(path), 'status': 'Pending ⌛'}
+                for path in iter_xlsx(main_folder_path, recursive=True)]
             
             if not files_to_process:
                 st.warning("No files found to process!")
@@ -815,40 +1192,61 @@ class Dashboard:
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                for idx, file_info in enumerate(files_to_process):
-                    try:
-                        file_path = file_info['path']
-                        status_text.text(f"Processing: {file_info['name']}")
-                        
-                        # Process file
-                        df = pd.read_excel(file_path)
-                        df['ssnit'] = df['ssnit'].astype(str).str.strip()
-                        
-                        # Map SSNIT data
-                        for ssnit_num in df['ssnit'].unique():
-                            mask = df['ssnit'] == ssnit_num
-                            if ssnit_num in vlookup_dict:
-                                data = vlookup_dict[ssnit_num]
-                                for field, value in data.items():
-                                    if value:  # Only update if value exists
-                                        df.loc[mask, field] = value
-                        
-                        # Calculate tiers
-                        df['salary'] = pd.to_numeric(df['salary'].astype(str).str.replace(',', '').str.strip(), errors='coerce')
-                        df['tier1'] = 0
-                        df['tier2'] = df['salary'] * 0.05
-                        
-                        # Save processed file
-                        output_columns = ['accountno', 'surname', 'first_name', 'other_name', 'ssnit', 'tier1', 'tier2']
-                        df[output_columns].to_excel(file_path, index=False)
-                        
-                        files_df.loc[idx, 'status'] = 'Processed ✅'
-                        
-                    except Exception as e:
-                        files_df.loc[idx, 'status'] = 'Failed'
-                        st.error(f"Error processing {file_info['name']}: {str(e)}")
+                def _process_one(file_info):
+                    """Read, map and rewrite a single schedule file"""
+                    file_path = file_info['path']
+                    
+                    # Process file; only the output columns plus salary
+                    # are ever consumed, so skip parsing the rest
+                    df = read_schedule(file_path, columns=(
+                        'ssnit', 'salary', 'accountno', 'surname', 'first_name', 'other_name'))
+                    _normalize_ssnit(df)
                     
-                    progress_bar.progress((idx + 1) / len(files_to_process))
+                    # Map SSNIT data: one aligned lookup against the
+                    # mapping frame, then fill gaps from the schedule's
+                    # own columns so unmapped rows keep their values
+                    mapped = mapping_df.reindex(df['ssnit'])
+                    mapped.index = df.index
+                    for field in mapping_fields:
+                        if field in df.columns:
+                            df[field] = mapped[field].fillna(df[field])
+                        else:
+                            df[field] = mapped[field]
+                    
+                    # Calculate tiers
+                    df['salary'] = _clean_salary(df['salary'])
+                    df['tier1'] = 0
+                    df['tier2'] = df['salary'] * 0.05
+                    
+                    # Save processed file
+                    output_columns = ['accountno', 'surname', 'first_name', 'other_name', 'ssnit', 'tier1', 'tier2']
+                    _write_xlsx(df[output_columns], file_path)
+                
+                # Each file is independent, so process them in parallel;
+                # the workers only touch their own file and the shared
+                # read-only mapping, while every Streamlit update stays
+                # on the main thread. Statuses collect in a plain numpy
+                # array -- per-item .loc writes would pay the pandas
+                # setitem machinery once per file
+                statuses = np.empty(len(files_to_process), dtype=object)
+                statuses[:] = 'Pending ⌛'
+                done = 0
+                with ThreadPoolExecutor(max_workers=_MAX_SCAN_WORKERS) as executor:
+                    futures = {executor.submit(_process_one, file_info): idx
+                               for idx, file_info in enumerate(files_to_process)}
+                    for future in as_completed(futures):
+                        idx = futures[future]
+                        try:
+                            future.result()
+                            statuses[idx] = 'Processed ✅'
+                        except Exception as e:
+                            statuses[idx] = 'Failed'
+                            st.error(f"Error processing {files_to_process[idx]['name']}: {str(e)}")
+                        done += 1
+                        status_text.text(f"Processed: {files_to_process[idx]['name']}")
+                        progress_bar.progress(done / len(files_to_process))
+                
+                files_df['status'] = statuses
                 
                 progress_bar.empty()
                 status_text.empty()
@@ -906,10 +1304,9 @@ class Dashboard:
             all_files = []
             for folder in folders_to_process:
                 folder_path = os.path.join(main_folder_path, folder)
-                for file in os.listdir(folder_path):
-                    if (file.endswith('.xlsx') and 
-                        not file.startswith(('vlookup_', 'duplicate_ssnit_', '._', '~$')) and
-                        '_' not in file):  # Skip already processed files
+                for path in iter_xlsx(folder_path):
+                    file = os.path.basename(path)
+                    if '_' not in file:  # Skip already processed files
                         all_files.append({
                             'Folder': folder,
                             'File Name': file,
@@ -942,104 +1339,101 @@ class Dashboard:
                     status_container = st.empty()
                     processed_count = 0
                     
-                    for idx, file_info in enumerate(all_files):
+                    def _append_one(file_info):
+                        """Total one schedule and rename it; returns display data"""
                         folder = file_info['Folder']
                         file = file_info['File Name']
                         folder_path = os.path.join(main_folder_path, folder)
                         file_path = os.path.join(folder_path, file)
                         
-                        status_text.text(f"Processing: {folder}/{file}")
+                        # Read the Excel file (only the columns shown or
+                        # totalled; dtype=str applies, so re-coerce tiers)
+                        df = read_schedule(file_path, columns=(
+                            'accountno', 'surname', 'first_name', 'other_name',
+                            'ssnit', 'tier1', 'tier2'))
                         
-                        try:
-                            # Read the Excel file
-                            df = pd.read_excel(file_path)
-                            
-                            # Calculate total tier2
-                            if 'tier2' not in df.columns:
-                                raise ValueError(f"tier2 column not found in {file}")
-                            
-                            total_tier2 = df['tier2'].sum()
-                            total_tier2_formatted = f"{total_tier2:.2f}"
-                            
-                            # Create new filename with total amount
-                            filename_without_extension = os.path.splitext(file)[0]
-                            extension = '.xlsx'
-                            new_filename = f"{filename_without_extension}_{total_tier2_formatted}{extension}"
-                            new_file_path = os.path.join(folder_path, new_filename)
-                            
-                            # Rename the file
-                            os.rename(file_path, new_file_path)
-                            
-                            files_df.loc[idx, 'Status'] = 'Processed ✅'
-                            processed_count += 1
+                        # Calculate total tier2
+                        if 'tier2' not in df.columns:
+                            raise ValueError(f"tier2 column not found in {file}")
+                        
+                        df['tier2'] = pd.to_numeric(df['tier2'], errors='coerce')
+                        total_tier2 = df['tier2'].sum()
+                        total_tier2_formatted = f"{total_tier2:.2f}"
+                        
+                        # Create new filename with total amount
+                        filename_without_extension = os.path.splitext(file)[0]
+                        extension = '.xlsx'
+                        new_filename = f"{filename_without_extension}_{total_tier2_formatted}{extension}"
+                        new_file_path = os.path.join(folder_path, new_filename)
+                        
+                        # Rename the file
+                        os.rename(file_path, new_file_path)
+                        
+                        return new_filename, len(df), total_tier2
+                    
+                    # The files are independent, so total and rename them
+                    # in parallel; the workers never call Streamlit — all
+                    # display happens on the main thread as results land.
+                    # The full status table is re-serialized to the
+                    # frontend on a coarse stride only; per-file feedback
+                    # goes through the lightweight status line instead
+                    table_stride = max(1, len(all_files) // 20)
+                    statuses = np.empty(len(all_files), dtype=object)
+                    statuses[:] = 'Pending ⏳'
+                    with ThreadPoolExecutor(max_workers=_MAX_SCAN_WORKERS) as executor:
+                        futures = {executor.submit(_append_one, file_info): idx
+                                   for idx, file_info in enumerate(all_files)}
+                        done = 0
+                        for future in as_completed(futures):
+                            idx = futures[future]
+                            file_info = all_files[idx]
+                            folder = file_info['Folder']
+                            file = file_info['File Name']
+                            done += 1
+                            try:
+                                new_filename, record_count, total_tier2 = future.result()
+                                statuses[idx] = 'Processed ✅'
+                                processed_count += 1
+                                status_text.text(
+                                    f"{done}/{len(all_files)} — {folder}/{new_filename} "
+                                    f"({record_count} records, ₵{total_tier2:,.2f})")
+                            except Exception as e:
+                                statuses[idx] = 'Failed ❌'
+                                st.error(f"Error processing {folder}/{file}: {str(e)}")
                             
-                            # Display data in expander
-                            with st.expander(f"View Results: {folder}/{new_filename}", expanded=False):
-                                st.markdown("##### Sample of Processed Data")
-                                st.dataframe(
-                                    df.head(),
+                            if done % table_stride == 0:
+                                files_df['Status'] = statuses
+                                status_container.dataframe(
+                                    files_df,
                                     column_config={
-                                        "accountno": st.column_config.Column(
-                                            "Account Number",
-                                            width="medium"
-                                        ),
-                                        "surname": st.column_config.Column(
-                                            "Surname",
-                                            width="medium"
-                                        ),
-                                        "first_name": st.column_config.Column(
-                                            "First Name",
-                                            width="medium"
-                                        ),
-                                        "other_name": st.column_config.Column(
-                                            "Other Name",
-                                            width="medium"
-                                        ),
-                                        "ssnit": st.column_config.Column(
-                                            "SSNIT Number",
-                                            width="medium"
-                                        ),
-                                        "tier1": st.column_config.NumberColumn(
-                                            "Tier 1",
-                                            format="₵%.2f",
-                                            width="medium"
-                                        ),
-                                        "tier2": st.column_config.NumberColumn(
-                                            "Tier 2",
-                                            format="₵%.2f",
+                                        "Folder": "Schedule Folder",
+                                        "File Name": "Schedule Files",
+                                        "Status": st.column_config.Column(
+                                            "Status",
+                                            help="Processing status of each file",
                                             width="medium"
                                         )
                                     },
                                     hide_index=True
                                 )
-                                
-                                # Display file statistics
-                                col1, col2 = st.columns(2)
-                                with col1:
-                                    st.metric("Total Records", len(df))
-                                with col2:
-                                    st.metric("Total Tier 2", f"₵{total_tier2:,.2f}")
-                        
-                        except Exception as e:
-                            files_df.loc[idx, 'Status'] = 'Failed ❌'
-                            st.error(f"Error processing {folder}/{file}: {str(e)}")
-                        
-                        # Update status display
-                        status_container.dataframe(
-                            files_df,
-                            column_config={
-                                "Folder": "Schedule Folder",
-                                "File Name": "Schedule Files",
-                                "Status": st.column_config.Column(
-                                    "Status",
-                                    help="Processing status of each file",
-                                    width="medium"
-                                )
-                            },
-                            hide_index=True
-                        )
-                        
-                        progress_bar.progress((idx + 1) / len(files_df))
+                            
+                            progress_bar.progress(done / len(files_df))
+                    
+                    # Final render so the table reflects every file
+                    files_df['Status'] = statuses
+                    status_container.dataframe(
+                        files_df,
+                        column_config={
+                            "Folder": "Schedule Folder",
+                            "File Name": "Schedule Files",
+                            "Status": st.column_config.Column(
+                                "Status",
+                                help="Processing status of each file",
+                                width="medium"
+                            )
+                        },
+                        hide_index=True
+                    )
                     
                     progress_bar.empty()
                     status_text.empty()
@@ -1084,26 +1478,30 @@ class Dashboard:
             return
         
         try:
-            # Read the VLOOKUP file
-            df = pd.read_excel(vlookup_path)
+            # Read the VLOOKUP file through the cached loader
+            df = load_vlookup(main_folder_path)
             
             # Create a copy of the DataFrame for case-insensitive comparison
             df_compare = df.copy()
             
-            # Combine name columns and standardize
-            df_compare['full_name'] = df_compare.apply(
-                lambda row: ' '.join(filter(None, [
-                    str(row['Surname']).strip(),
-                    str(row['First_Name']).strip(),
-                    str(row['Other_Names']).strip()
-                ])), axis=1
-            ).str.upper()
+            # Combine name columns and standardize in one vectorized
+            # pass instead of a Python callable per row
+            full = (df_compare['Surname'].fillna('').astype(str).str.strip() + ' ' +
+                    df_compare['First_Name'].fillna('').astype(str).str.strip() + ' ' +
+                    df_compare['Other_Names'].fillna('').astype(str).str.strip())
+            df_compare['full_name'] = full.str.replace(r'\s+', ' ', regex=True).str.strip().str.upper()
             
-            # Find duplicates based on SSNIT numbers
-            ssnit_duplicates = df[df.duplicated(subset=['Ssnit'], keep=False)].sort_values('Ssnit')
+            # Find duplicates based on SSNIT numbers; the categorical
+            # view makes the duplicate scan run on integer codes
+            ssnit_duplicates = df[df['Ssnit'].astype('category').duplicated(keep=False)].sort_values('Ssnit')
             
-            # Find duplicates based on combined names
-            duplicate_mask = df_compare.duplicated(subset=['full_name'], keep=False)
+            # Find duplicates based on combined names; hashing the
+            # column to uint64 once beats re-hashing each string inside
+            # duplicated()
+            name_hashes = pd.Series(
+                pd.util.hash_array(df_compare['full_name'].to_numpy()),
+                index=df_compare.index)
+            duplicate_mask = name_hashes.duplicated(keep=False)
             name_duplicates = df[duplicate_mask].sort_values(['Surname', 'First_Name', 'Other_Names'])
             
             # Display results
@@ -1147,73 +1545,27 @@ def standardize_name(name):
     """Standardize name by sorting words alphabetically"""
     return ' '.join(sorted(str(name).upper().split()))
 
-def create_comprehensive_mapping(vlookup_df, master_df):
-    """Create a comprehensive mapping using both VLOOKUP and master data"""
-    mapping = {}
-    
-    # Clean and standardize SSNIT numbers in both dataframes
-    vlookup_df['Ssnit'] = vlookup_df['Ssnit'].astype(str).str.strip()
-    master_df['Ssnit'] = master_df['Ssnit'].astype(str).str.strip()
-    
-    # First populate from VLOOKUP (primary source)
-    for _, row in vlookup_df.iterrows():
-        ssnit = row['Ssnit']
-        if pd.notna(ssnit) and str(ssnit).strip():
-            mapping[ssnit] = {
-                'accountno': str(row['Accountno']).strip() if pd.notna(row['Accountno']) else None,
-                'surname': str(row['Surname']).strip() if pd.notna(row['Surname']) else None,
-                'first_name': str(row['First_Name']).strip() if pd.notna(row['First_Name']) else None,
-                'other_name': str(row['Other_Names']).strip() if pd.notna(row['Other_Names']) else None,
-                'source': 'VLOOKUP'
-            }
-    
-    # Supplement with master data where missing
-    for _, row in master_df.iterrows():
-        ssnit = row['Ssnit']
-        if pd.notna(ssnit) and str(ssnit).strip():
-            if ssnit not in mapping:
-                # Add new entry from master
-                mapping[ssnit] = {
-                    'accountno': str(row['Client Account Number']).strip() if pd.notna(row['Client Account Number']) else None,
-                    'surname': str(row['Surname']).strip() if pd.notna(row['Surname']) else None,
-                    'first_name': str(row['First Name']).strip() if pd.notna(row['First Name']) else None,
-                    'other_name': str(row['Other Names']).strip() if pd.notna(row['Other Names']) else None,
-                    'source': 'Master'
-                }
-            else:
-                # Fill in missing data from master
-                entry = mapping[ssnit]
-                if not entry['accountno']:
-                    entry['accountno'] = str(row['Client Account Number']).strip() if pd.notna(row['Client Account Number']) else None
-                if not entry['surname']:
-                    entry['surname'] = str(row['Surname']).strip() if pd.notna(row['Surname']) else None
-                if not entry['first_name']:
-                    entry['first_name'] = str(row['First Name']).strip() if pd.notna(row['First Name']) else None
-                if not entry['other_name']:
-                    entry['other_name'] = str(row['Other Names']).strip() if pd.notna(row['Other Names']) else None
-    
-    return mapping
+def process_dataframe(df, ssnit_mapping):
+    """Process DataFrame using a prebuilt SSNIT-Account mapping.
 
-def process_dataframe(df, vlookup_dict, master_dict):
-    """Process DataFrame using consistent SSNIT-Account mapping"""
-    # Get the consistent mapping
-    ssnit_mapping = create_comprehensive_mapping(vlookup_dict, master_dict)
-    
+    The mapping comes from create_comprehensive_mapping, built once by
+    the caller; rebuilding it here would redo the full vlookup+master
+    merge for every schedule file.
+    """
     # Convert to string and clean SSNIT numbers
-    df['ssnit'] = df['ssnit'].astype(str).str.strip()
+    _normalize_ssnit(df)
     
-    # Create result DataFrame
-    result_df = pd.DataFrame(index=df.index)
+    # One aligned lookup fills all four mapped fields at once instead
+    # of four .map passes through a Python closure
+    result_df = ssnit_mapping.to_frame().reindex(df['ssnit'])
+    result_df.index = df.index
     result_df['ssnit'] = df['ssnit']
-    
-    # Map the consistent account numbers and other fields
-    for field in ['accountno', 'surname', 'first_name', 'other_name']:
-        result_df[field] = df['ssnit'].map(
-            lambda x: ssnit_mapping.get(x, {}).get(field, '#N/A' if field == 'accountno' else '')
-        )
+    result_df['accountno'] = result_df['accountno'].fillna('#N/A')
+    result_df[['surname', 'first_name', 'other_name']] = (
+        result_df[['surname', 'first_name', 'other_name']].fillna(''))
     
     # Handle salary and tiers
-    df['salary'] = pd.to_numeric(df['salary'].astype(str).str.replace(',', '').str.strip(), errors='coerce')
+    df['salary'] = _clean_salary(df['salary'])
     result_df['tier1'] = 0
     result_df['tier2'] = df['salary'] * 0.05
     
@@ -1228,216 +1580,502 @@ def check_and_standardize_accounts(folder_path, vlookup_dict, master_dict):
         return False
     
     modified_files = []
+    errors = []
     
-    # Process each schedule file
-    for root, _, files in os.walk(folder_path):
-        for file in files:
-            if (file.lower().endswith('.xlsx') and 
-                not file.startswith(('vlookup_', 'duplicate_', '._', '~$'))):
-                file_path = os.path.join(root, file)
-                try:
-                    # Read file
-                    df = pd.read_excel(file_path)
-                    if 'ssnit' not in df.columns:
-                        continue
-                    
-                    # Clean SSNIT numbers
-                    df['ssnit'] = df['ssnit'].astype(str).str.strip()
-                    
-                    # Find records that need standardization
-                    changes_made = False
-                    for idx, row in df.iterrows():
-                        ssnit = row['ssnit']
-                        if ssnit in ssnit_mapping:
-                            standard_account = ssnit_mapping[ssnit]['accountno']
-                            if row.get('accountno') != standard_account:
-                                df.at[idx, 'accountno'] = standard_account
-                                changes_made = True
-                    
-                    # Save changes if any made
-                    if changes_made:
-                        df.to_excel(file_path, index=False)
-                        modified_files.append(file)
-                        
-                except Exception as e:
-                    st.error(f"Error processing {file}: {str(e)}")
+    # Build the SSNIT -> standard account lookup once; the per-file
+    # work then reduces to one vectorized map plus a diff mask
+    account_series = pd.Series(ssnit_mapping.accountno, index=ssnit_mapping.keys)
+    
+    # Process each schedule file; the header sniff in
+    # list_schedule_files already dropped non-schedule workbooks
+    for file_path in list_schedule_files(folder_path):
+        file = os.path.basename(file_path)
+        try:
+            # Read file
+            df = read_schedule(file_path)
+            if 'ssnit' not in df.columns:
+                continue
+
+            # Clean SSNIT numbers; categorical codes make the
+            # map and comparisons work on ints, not str hashing.
+            # Uppercase to match the mapping keys, which
+            # create_comprehensive_mapping uppercases on build.
+            df['ssnit'] = (_normalize_ssnit(df)['ssnit']
+                           .str.upper().astype('category'))
+
+            # Standardize account numbers where the mapping
+            # disagrees with what the schedule currently holds
+            standard = df['ssnit'].map(account_series)
+            if 'accountno' in df.columns:
+                diff_mask = standard.notna() & (df['accountno'].astype(str) != standard.astype(str))
+            else:
+                diff_mask = standard.notna()
+
+            # Save changes if any made
+            if diff_mask.any():
+                df.loc[diff_mask, 'accountno'] = standard[diff_mask]
+                _write_xlsx(df, file_path)
+                modified_files.append(file)
+
+        except Exception as e:
+            errors.append((file, str(e)))
     
+    # Render the error list in one pass; a st.error per file forces a
+    # browser re-render inside the loop
+    if errors:
+        st.error(f"Errors in {len(errors)} files:")
+        st.dataframe(pd.DataFrame(errors, columns=['File', 'Error']), hide_index=True)
     if modified_files:
         st.success(f"Updated {len(modified_files)} files with standardized account numbers")
         return True
     
     return True
 
-def check_individual_schedule_duplicates(folder_path):
+def _has_ssnit(path):
+    """Cheap header sniff: does the first row name an ssnit column?
+
+    read_only mode parses just the header row, so mixed folders skip
+    non-schedule workbooks without paying for a full parse.
+    """
+    try:
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            header = next(wb.active.iter_rows(min_row=1, max_row=1,
+                                              values_only=True), ())
+        finally:
+            wb.close()
+        return any(h and str(h).strip().lower() == 'ssnit' for h in header)
+    except Exception:
+        # Keep unreadable files in the list; the full parse reports
+        # the real error where the user expects it
+        return True
+
+def list_schedule_files(folder_path):
+    """Canonical schedule-file list for a company folder, scanned once.
+
+    The duplicate pass and process_schedule_files iterate the same set
+    of files; collecting it in a single scandir walk and threading the
+    list through both stages halves the directory traffic, which is
+    the dominant latency on network shares. Files whose header lacks
+    an ssnit column are dropped here, before any full parse.
+    """
+    return [path for path in iter_xlsx(folder_path, recursive=True)
+            if _has_ssnit(path)]
+
+def _group_first(keys, values):
+    """First value per key group, computed without a pandas groupby.
+
+    np.unique assigns group ids in one C-level pass and return_index
+    points at each group's first occurrence in original order, so no
+    hashed group object is built. Returns (unique keys, first value
+    per key, inverse ids); values[inverse] broadcasts the firsts back
+    over the rows.
+    """
+    uniq, first_pos, inv = np.unique(keys, return_index=True, return_inverse=True)
+    return uniq, values[first_pos], inv
+
+def check_individual_schedule_duplicates(folder_path, schedule_files=None):
     """Check for duplicates within each schedule file and standardize them"""
     st.subheader("🔍 Pre-validation Duplicate Check")
     
     duplicates_found = False
     duplicates_by_file = {}
+    df_cache = {}
+    errors = []
     
-    for root, _, files in os.walk(folder_path):
-        for file in files:
-            if (file.lower().endswith('.xlsx') and 
-                not file.startswith(('vlookup_', 'duplicate_', '._', '~$'))):
-                file_path = os.path.join(root, file)
-                try:
-                    df = pd.read_excel(file_path)
-                    if 'ssnit' not in df.columns:
-                        continue
-                        
-                    df['ssnit'] = df['ssnit'].astype(str).str.strip()
-                    duplicates = df[df.duplicated(subset='ssnit', keep=False)]
-                    
-                    if not duplicates.empty:
-                        duplicates_found = True
-                        duplicates_by_file[file] = duplicates
-                        
-                        # Show duplicates in expandable section
-                        with st.expander(f"📄 Found duplicates in {file}:"):
-                            st.dataframe(duplicates)
-                            
-                            # Group by SSNIT number
-                            for ssnit in duplicates['ssnit'].unique():
-                                ssnit_entries = duplicates[duplicates['ssnit'] == ssnit]
-                                st.markdown(f"##### SSNIT: {ssnit}")
-                                
-                                # Take the first account number for standardization
-                                primary_account = ssnit_entries.iloc[0]['accountno']
-                                
-                                # Update all entries with this SSNIT to use the same account
-                                mask = df['ssnit'] == ssnit
-                                df.loc[mask, 'accountno'] = primary_account
-                                
-                                st.code(f"""
-                                Standardized account number to: {primary_account}
-                                """)
-                            
-                            # Save changes back to file
-                            df.to_excel(file_path, index=False)
-                            
-                except Exception as e:
-                    st.error(f"Error checking {file}: {str(e)}")
+    if schedule_files is None:
+        schedule_files = list_schedule_files(folder_path)
+    for file_path in schedule_files:
+        file = os.path.basename(file_path)
+        try:
+            mtime = os.path.getmtime(file_path)
+            df = _read_mirror_or_xlsx(file_path)
+            if 'ssnit' not in df.columns:
+                continue
+
+            # Categorical ssnit lets duplicated() and the later
+            # equality masks compare integer codes instead of strings
+            df['ssnit'] = _normalize_ssnit(df)['ssnit'].astype('category')
+            dirty = False
+            
+            # Fused detect + normalize: one duplicated() pass flags the
+            # rows (sentinel and missing SSNITs excluded), and a grouped
+            # transform over just those rows broadcasts each group's
+            # first account number -- no per-SSNIT rescans, no second
+            # full-frame groupby
+            dup_mask = (df.duplicated(subset='ssnit', keep=False) &
+                        df['ssnit'].notna() &
+                        ~df['ssnit'].isin(_SSNIT_SENTINEL_INDEX))
+            duplicates = df.loc[dup_mask]
+
+            if not duplicates.empty:
+                duplicates_found = True
+                duplicates_by_file[file] = duplicates
+
+                # Show duplicates in expandable section
+                with st.expander(f"📄 Found duplicates in {file}:"):
+                    st.dataframe(duplicates)
+
+                    uniq, firsts, inv = _group_first(
+                        duplicates['ssnit'].to_numpy(),
+                        duplicates['accountno'].to_numpy())
+                    df.loc[dup_mask, 'accountno'] = firsts[inv]
+
+                    st.markdown("##### Standardized Account Numbers")
+                    st.dataframe(
+                        pd.DataFrame({'ssnit': uniq,
+                                      'Standardized Account': firsts}),
+                        hide_index=True
+                    )
+
+                    # Defer the save: process_schedule_files writes
+                    # each file exactly once after all transformations
+                    dirty = True
+
+            # Every cleaned frame rides along to the processing pass,
+            # which skips the re-read as long as the mtime still
+            # matches; dirty ones additionally force the write there
+            df_cache[file_path] = (mtime, df, dirty)
+
+        except Exception as e:
+            errors.append((file, str(e)))
     
+    if errors:
+        st.error(f"Errors in {len(errors)} files:")
+        st.dataframe(pd.DataFrame(errors, columns=['File', 'Error']), hide_index=True)
     if duplicates_found:
         st.warning("🔄 Duplicates were found and standardized")
         if st.button("Continue with Validation", type="primary"):
-            return True
-        return False
+            return True, df_cache
+        return False, df_cache
     else:
         st.success("✅ No duplicates found in schedule files")
         if st.button("Continue with Validation", type="primary"):
-            return True
-        return False
+            return True, df_cache
+        return False, df_cache
+
+@dataclass(frozen=True)
+class Mapping:
+    """Struct-of-arrays SSNIT mapping.
+
+    One contiguous ndarray per field plus a key->row dict replaces the
+    old dict-of-dicts, which paid a five-slot dict per SSNIT; at scale
+    that header overhead dwarfed the strings themselves. Lookups are
+    either dict hits on index or one aligned reindex over to_frame().
+    """
+    keys: np.ndarray
+    accountno: np.ndarray
+    surname: np.ndarray
+    first_name: np.ndarray
+    other_name: np.ndarray
+    index: dict
+
+    @classmethod
+    def from_frame(cls, mapping_df):
+        keys = mapping_df.index.to_numpy()
+        return cls(keys,
+                   mapping_df['accountno'].to_numpy(),
+                   mapping_df['surname'].to_numpy(),
+                   mapping_df['first_name'].to_numpy(),
+                   mapping_df['other_name'].to_numpy(),
+                   {key: i for i, key in enumerate(keys)})
+
+    def to_frame(self):
+        """Indexed DataFrame view for the aligned-reindex hot paths"""
+        return pd.DataFrame(
+            {'accountno': self.accountno, 'surname': self.surname,
+             'first_name': self.first_name, 'other_name': self.other_name},
+            index=pd.Index(self.keys, name='Ssnit'))
+
+    def __len__(self):
+        return len(self.keys)
 
 def create_comprehensive_mapping(vlookup_df, master_df):
-    """Create a comprehensive mapping using both VLOOKUP and master data"""
-    mapping = {}
+    """Create a comprehensive SSNIT mapping using both VLOOKUP and master data"""
+    # Align the two sources on one schema, tagging each row's origin
+    cols = ['Ssnit', 'accountno', 'surname', 'first_name', 'other_name']
+    v = vlookup_df.rename(columns={
+        'Accountno': 'accountno', 'Surname': 'surname',
+        'First_Name': 'first_name', 'Other_Names': 'other_name'})
+    m = master_df.rename(columns={
+        'Client Account Number': 'accountno', 'Surname': 'surname',
+        'First Name': 'first_name', 'Other Names': 'other_name'})
+    combined = pd.concat([
+        v[cols].assign(source='VLOOKUP'),
+        m[cols].assign(source='Master'),
+    ], ignore_index=True)
     
-    # Clean and standardize SSNIT numbers in both dataframes
-    vlookup_df['Ssnit'] = vlookup_df['Ssnit'].astype(str).str.strip().upper()
-    master_df['Ssnit'] = master_df['Ssnit'].astype(str).str.strip().upper()
+    # Vectorized cleanup in one shot over the fast string dtype:
+    # strip every field, uppercase the key and drop the sentinel
+    # SSNITs the old per-row checks filtered out (missing keys fold
+    # into the 'NAN' sentinel, as str(nan).upper() used to produce)
+    combined[cols[1:]] = (combined[cols[1:]].astype(_STRING_DTYPE)
+                          .apply(lambda s: s.str.strip()).fillna(''))
+    combined['Ssnit'] = (combined['Ssnit'].astype(_STRING_DTYPE)
+                         .str.strip().str.upper().fillna('NAN'))
+    combined = combined[~combined['Ssnit'].isin(_SSNIT_SENTINEL_INDEX)]
     
-    # Track unmapped SSNITs
-    unmapped_ssnits = set()
+    # VLOOKUP rows were concatenated first, so groupby().first() keeps
+    # them and master only contributes SSNITs the vlookup lacks
+    mapping_df = combined.groupby('Ssnit', sort=False).first()
     
-    # First populate from VLOOKUP (primary source)
-    for _, row in vlookup_df.iterrows():
-        ssnit = row['Ssnit']
-        if pd.notna(ssnit) and str(ssnit).strip() and ssnit not in ['NAN', 'NONE', '']:
-            mapping[ssnit] = {
-                'accountno': str(row['Accountno']).strip() if pd.notna(row['Accountno']) else '',
-                'surname': str(row['Surname']).strip() if pd.notna(row['Surname']) else '',
-                'first_name': str(row['First_Name']).strip() if pd.notna(row['First_Name']) else '',
-                'other_name': str(row['Other_Names']).strip() if pd.notna(row['Other_Names']) else '',
-                'source': 'VLOOKUP'
-            }
-    
-    # Supplement with master data
-    for _, row in master_df.iterrows():
-        ssnit = row['Ssnit']
-        if pd.notna(ssnit) and str(ssnit).strip() and ssnit not in ['NAN', 'NONE', '']:
-            if ssnit not in mapping:
-                mapping[ssnit] = {
-                    'accountno': str(row['Client Account Number']).strip() if pd.notna(row['Client Account Number']) else '',
-                    'surname': str(row['Surname']).strip() if pd.notna(row['Surname']) else '',
-                    'first_name': str(row['First Name']).strip() if pd.notna(row['First Name']) else '',
-                    'other_name': str(row['Other Names']).strip() if pd.notna(row['Other Names']) else '',
-                    'source': 'Master'
-                }
-            else:
-                # Fill in missing data from master
-                entry = mapping[ssnit]
-                if not entry['accountno']:
-                    entry['accountno'] = str(row['Client Account Number']).strip() if pd.notna(row['Client Account Number']) else ''
+    # Back-fill empty account numbers from the master slice, matching
+    # the old "master fills the gaps" second pass
+    master_accounts = (combined[combined['source'] == 'Master']
+                       .drop_duplicates('Ssnit').set_index('Ssnit')['accountno'])
+    mapping_df['accountno'] = mapping_df['accountno'].where(
+        mapping_df['accountno'].ne(''),
+        master_accounts.reindex(mapping_df.index).fillna(''))
     
-    return mapping
+    return Mapping.from_frame(mapping_df)
+
+_SCHEDULE_UPDATE_COLS = ['accountno', 'surname', 'first_name', 'other_name']
+
+def _mirror_path(path):
+    """Parquet mirror location for a schedule file, under .cache/"""
+    p = Path(path)
+    return p.parent / '.cache' / (p.stem + '.parquet')
+
+def _read_mirror_or_xlsx(path):
+    """Load a schedule from its parquet mirror when fresh, else the xlsx"""
+    mirror = _mirror_path(path)
+    try:
+        if mirror.exists() and mirror.stat().st_mtime >= os.path.getmtime(path):
+            return pd.read_parquet(mirror)
+    except Exception:
+        # Unreadable mirror; fall back to the xlsx source
+        pass
+    return read_schedule(path)
+
+def _write_mirror(df, path):
+    """Refresh a schedule's parquet mirror; returns False on failure"""
+    mirror = _mirror_path(path)
+    try:
+        mirror.parent.mkdir(exist_ok=True)
+        df.to_parquet(mirror, engine="pyarrow", compression="zstd")
+        return True
+    except Exception:
+        return False
+
+def finalize_to_xlsx(folder_path, schedule_files=None):
+    """Flush updated parquet mirrors back to their xlsx files.
+
+    The processing passes write their results to the mirrors only --
+    parquet round-trips are an order of magnitude cheaper than xlsx --
+    so the expensive Excel serialization happens once per file here,
+    at the end of a validation session, instead of once per pass.
+    """
+    if schedule_files is None:
+        schedule_files = list_schedule_files(folder_path)
+    flushed = []
+    for path in schedule_files:
+        mirror = _mirror_path(path)
+        try:
+            if mirror.exists() and mirror.stat().st_mtime > os.path.getmtime(path):
+                _write_xlsx(pd.read_parquet(mirror), path)
+                flushed.append(os.path.basename(path))
+        except Exception as e:
+            st.error(f"Error finalizing {os.path.basename(path)}: {str(e)}")
+    if flushed:
+        st.success(f"✅ Rewrote {len(flushed)} schedule files from their mirrors")
+    return flushed
+
+def _process_schedule_file(path, map_df, df=None, dirty=False):
+    """Worker for process_schedule_files: read, map and rewrite one file.
+
+    Runs in a separate process, so it must not touch Streamlit; any
+    failure travels back to the parent in the returned record. df, when
+    given, is a frame the duplicate pass already read and cleaned -- it
+    skips the re-read, and with dirty set its deferred standardization
+    is written here even if the mapping changes nothing.
+    """
+    file = os.path.basename(path)
+    try:
+        if df is None:
+            df = _read_mirror_or_xlsx(path)
+        if 'ssnit' not in df.columns:
+            return path, False, None, None
+        
+        # Clean SSNIT numbers on the unique values only: the
+        # strip/upper passes run over the category set, and the rows
+        # carry integer codes into that set. NaN becomes the 'NAN'
+        # sentinel, as the old astype(str) pass produced.
+        s = df['ssnit'].astype('string').fillna('NAN')
+        cats = s.unique()
+        clean = pd.Index(cats).astype(str).str.strip().str.upper()
+        cat = pd.Categorical(s.map(dict(zip(cats, clean))))
+        df['ssnit'] = cat
+        
+        # Rows are updated only where the mapping carries a valid
+        # account number, same as the old per-row check; the lookup
+        # happens once per category and broadcasts through the codes
+        per_cat = map_df.reindex(cat.categories)
+        joined = per_cat.take(cat.codes)
+        joined.index = df.index
+        valid = joined['accountno'].notna() & joined['accountno'].ne('')
+        
+        # On re-runs the mapping usually reproduces what the file
+        # already holds; compare against a pre-update snapshot and
+        # skip the write when no cell actually changed
+        modified = False
+        if valid.any():
+            before = df.reindex(columns=_SCHEDULE_UPDATE_COLS).copy()
+            df.loc[valid, _SCHEDULE_UPDATE_COLS] = joined.loc[valid, _SCHEDULE_UPDATE_COLS].values
+            modified = not before.equals(df[_SCHEDULE_UPDATE_COLS])
+        if modified or dirty:
+            # Land the update in the cheap parquet mirror; the xlsx is
+            # rewritten once per session by finalize_to_xlsx. Without
+            # pyarrow the write falls back to the xlsx directly.
+            if not _write_mirror(df, path):
+                _write_xlsx(df, path)
+            modified = True
+        
+        # Unmapped, non-sentinel SSNITs: decided per category, then
+        # gathered back to row positions through the codes
+        cat_unmapped = (~cat.categories.isin(map_df.index) &
+                        ~cat.categories.isin(_SSNIT_SENTINEL_INDEX))
+        unmapped = cat_unmapped[cat.codes]
+        file_unmapped = None
+        if unmapped.any():
+            positions = np.flatnonzero(unmapped)
+            file_unmapped = pd.DataFrame({
+                'file': file,
+                'ssnit': df['ssnit'].to_numpy()[positions],
+                'row': positions + 1,
+            })
+        
+        return path, modified, file_unmapped, None
+    except Exception as e:
+        return path, False, None, str(e)
+
+def _mapping_digest(map_df):
+    """Stable digest of a mapping frame, for the skip-unchanged cache"""
+    return hashlib.md5(
+        pd.util.hash_pandas_object(map_df, index=True).values.tobytes()).hexdigest()
 
-def process_schedule_files(folder_path, ssnit_mapping):
-    """Process schedule files with improved validation"""
+def process_schedule_files(folder_path, ssnit_mapping, df_cache=None, schedule_files=None):
+    """Process schedule files with improved validation.
+
+    df_cache optionally carries (mtime, frame, dirty) entries from the
+    duplicate pass: frames it already read and cleaned skip the
+    re-read here, and dirty ones get their deferred write. Entries are
+    dropped when the file's mtime moved on since they were captured.
+    schedule_files lets the caller reuse the list the duplicate pass
+    already scanned instead of walking the folder again.
+    """
     modified_files = []
-    unmapped_records = []
+    unmapped_frames = []
+    errors = []
+    df_cache = df_cache or {}
     
-    for root, _, files in os.walk(folder_path):
-        for file in files:
-            if (file.lower().endswith('.xlsx') and 
-                not file.startswith(('vlookup_', 'duplicate_', '._', '~$'))):
-                file_path = os.path.join(root, file)
-                try:
-                    df = pd.read_excel(file_path)
-                    if 'ssnit' not in df.columns:
-                        continue
-                    
-                    # Clean SSNIT numbers
-                    df['ssnit'] = df['ssnit'].astype(str).str.strip().upper()
-                    
-                    # Track changes and unmapped SSNITs
-                    changes_made = False
-                    file_unmapped = []
-                    
-                    # Process each row
-                    for idx, row in df.iterrows():
-                        ssnit = row['ssnit']
-                        if ssnit in ['NAN', 'NONE', '']:
-                            continue
-                            
-                        if ssnit in ssnit_mapping:
-                            # Update only if data exists in mapping
-                            data = ssnit_mapping[ssnit]
-                            if data['accountno']:  # Only update if we have a valid account number
-                                df.at[idx, 'accountno'] = data['accountno']
-                                df.at[idx, 'surname'] = data['surname']
-                                df.at[idx, 'first_name'] = data['first_name']
-                                df.at[idx, 'other_name'] = data['other_name']
-                                changes_made = True
-                        else:
-                            # Track unmapped SSNITs
-                            file_unmapped.append({
-                                'file': file,
-                                'ssnit': ssnit,
-                                'row': idx + 1
-                            })
-                    
-                    # Save changes if any were made
-                    if changes_made:
-                        df.to_excel(file_path, index=False)
-                        modified_files.append(file)
-                    
-                    # Add unmapped records
-                    unmapped_records.extend(file_unmapped)
-                    
-                except Exception as e:
-                    st.error(f"Error processing {file}: {str(e)}")
+    # Index the mapping once; the per-file update then becomes one
+    # aligned lookup instead of an iterrows walk with df.at writes
+    if ssnit_mapping is not None and len(ssnit_mapping):
+        map_df = ssnit_mapping.to_frame()
+    else:
+        map_df = pd.DataFrame(columns=_SCHEDULE_UPDATE_COLS)
+    
+    # Incremental-run cache: a file whose (mtime, size) and mapping
+    # digest both match the last successful run would produce the same
+    # output, so it never reaches the worker pool
+    cache_path = os.path.join(folder_path, '.schedule_cache.json')
+    try:
+        with open(cache_path) as fh:
+            run_cache = json.load(fh)
+    except (OSError, ValueError):
+        run_cache = {}
+    mapping_key = _mapping_digest(map_df)
+    
+    paths = schedule_files if schedule_files is not None else list_schedule_files(folder_path)
+    pending = []
+    skipped = 0
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            df_cache.pop(path, None)
+            continue
+        cached = df_cache.get(path)
+        if cached is not None and cached[0] != stat.st_mtime:
+            # The file changed behind the cache; fall back to a fresh read
+            df_cache.pop(path)
+            cached = None
+        if cached is None or not cached[2]:
+            entry = run_cache.get(path)
+            if (entry and entry.get('stat') == [stat.st_mtime, stat.st_size]
+                    and entry.get('mapping') == mapping_key):
+                skipped += 1
+                continue
+        pending.append(path)
+    
+    # The parse step is CPU-bound, so fan the files out to worker
+    # processes; every Streamlit call stays in the parent
+    if pending:
+        with ProcessPoolExecutor(max_workers=_MAX_SCAN_WORKERS) as executor:
+            futures = [executor.submit(_process_schedule_file, path, map_df,
+                                       *(df_cache[path][1:] if path in df_cache
+                                         else (None, False)))
+                       for path in pending]
+            results = [future.result() for future in futures]
+        ok_paths = []
+        for path, modified, file_unmapped, error in results:
+            if error:
+                errors.append((os.path.basename(path), error))
+                run_cache.pop(path, None)
+                continue
+            if modified:
+                modified_files.append(os.path.basename(path))
+            if file_unmapped is not None:
+                unmapped_frames.append(file_unmapped)
+            ok_paths.append(path)
+        
+        # Flush updated mirrors back to the real schedules now, before
+        # the stat snapshot below, so the cache records the finalized
+        # files rather than the stale pre-flush xlsx
+        finalize_to_xlsx(folder_path, ok_paths)
+        
+        for path in ok_paths:
+            try:
+                stat = os.stat(path)
+                mirror = _mirror_path(path)
+                if mirror.exists() and mirror.stat().st_mtime > stat.st_mtime:
+                    # The flush failed and the mirror still holds
+                    # unsaved updates; leave the file out of the cache
+                    # so the next run retries instead of skipping it
+                    run_cache.pop(path, None)
+                    continue
+                run_cache[path] = {'stat': [stat.st_mtime, stat.st_size],
+                                   'mapping': mapping_key}
+            except OSError:
+                run_cache.pop(path, None)
+    
+    # Persist the cache best effort; a write failure only means the
+    # next run reprocesses everything
+    try:
+        with open(cache_path, 'w') as fh:
+            json.dump(run_cache, fh)
+    except OSError:
+        pass
     
-    # Display results
+    # Display results; errors are buffered from the loop and rendered
+    # in one table so the hot path never triggers a page re-render
+    if errors:
+        st.error(f"Errors in {len(errors)} files:")
+        st.dataframe(pd.DataFrame(errors, columns=['File', 'Error']), hide_index=True)
+    if skipped:
+        st.info(f"⏭️ Skipped {skipped} unchanged files")
     if modified_files:
         st.success(f"✅ Updated {len(modified_files)} files with standardized data")
     
-    if unmapped_records:
-        st.warning("⚠️ Found unmapped SSNIT numbers:")
-        for record in unmapped_records:
-            st.write(f"File: {record['file']}, Row: {record['row']}, SSNIT: {record['ssnit']}")
+    # One concatenated table and a single render, instead of a
+    # st.write round-trip per unmapped row
+    unmapped_df = (pd.concat(unmapped_frames, ignore_index=True)
+                   if unmapped_frames else pd.DataFrame(columns=['file', 'ssnit', 'row']))
+    if not unmapped_df.empty:
+        st.warning(f"⚠️ Found {len(unmapped_df)} unmapped SSNIT numbers:")
+        st.dataframe(unmapped_df, hide_index=True)
     
-    return modified_files, unmapped_records
+    return modified_files, unmapped_df
         
     # Add this at the bottom of the file:
 if __name__ == "__main__":